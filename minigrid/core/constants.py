@@ -54,3 +54,7 @@ DIR_TO_VEC = [
     # Up (negative Y)
     np.array((0, -1)),
 ]
+
+# Same direction vectors as plain int tuples, for hot paths where
+# constructing an ndarray per access would be wasteful
+DIR_DELTAS = ((1, 0), (0, 1), (-1, 0), (0, -1))
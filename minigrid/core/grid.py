@@ -87,17 +87,35 @@ class Grid:
         self.vert_wall(x, y, h)
         self.vert_wall(x + w - 1, y, h)
 
-    def rotate_left(self):
+    def rotate_left(self, count=1):
         """
         Rotate the grid to the left (counter-clockwise)
+
+        All `count` rotations are fused into a single pass over the cells,
+        instead of materializing one intermediate grid per rotation.
         """
 
-        grid = Grid(self.height, self.width)
+        count %= 4
+
+        if count % 2 == 0:
+            grid = Grid(self.width, self.height)
+        else:
+            grid = Grid(self.height, self.width)
 
         for i in range(self.width):
             for j in range(self.height):
                 v = self.get(i, j)
-                grid.set(j, grid.height - 1 - i, v)
+
+                if count == 0:
+                    ni, nj = i, j
+                elif count == 1:
+                    ni, nj = j, grid.height - 1 - i
+                elif count == 2:
+                    ni, nj = grid.width - 1 - i, grid.height - 1 - j
+                else:
+                    ni, nj = grid.width - 1 - j, i
+
+                grid.set(ni, nj, v)
 
         return grid
 
@@ -209,28 +227,33 @@ class Grid:
 
         return img
 
-    def encode(self, vis_mask=None):
+    def encode(self, vis_mask=None, out=None):
         """
         Produce a compact numpy encoding of the grid
-        """
 
-        if vis_mask is None:
-            vis_mask = np.ones((self.width, self.height), dtype=bool)
-
-        array = np.zeros((self.width, self.height, 3), dtype="uint8")
-
-        for i in range(self.width):
-            for j in range(self.height):
-                if vis_mask[i, j]:
-                    v = self.get(i, j)
-
-                    if v is None:
-                        array[i, j, 0] = OBJECT_TO_IDX["empty"]
-                        array[i, j, 1] = 0
-                        array[i, j, 2] = 0
+        If `out` is given, it must be a (width, height, 3) uint8 array and
+        the encoding is written into it instead of allocating a new array.
+        """
 
-                    else:
-                        array[i, j, :] = v.encode()
+        if out is None:
+            array = np.zeros((self.width, self.height, 3), dtype="uint8")
+        else:
+            array = out
+            array[:, :, 1:] = 0
+
+        # Empty cells all share the same encoding, so they are filled in a
+        # single vectorized pass and only cells holding an object are
+        # visited in the loop below
+        array[:, :, 0] = OBJECT_TO_IDX["empty"]
+
+        width = self.width
+        for idx, v in enumerate(self.grid):
+            if v is not None:
+                array[idx % width, idx // width] = v.encode()
+
+        # Cells outside of the visibility mask are reported as unseen
+        if vis_mask is not None:
+            array[~vis_mask] = 0
 
         return array
 
@@ -20,6 +20,19 @@ class WorldObj:
     Base class for grid world objects
     """
 
+    # Fixed attribute slots: grids allocate one object per non-empty cell
+    # (and one Wall per out-of-view cell on every observation slice), so
+    # dropping the per-instance dict saves memory and speeds attribute access
+    __slots__ = (
+        "_type",
+        "_color",
+        "type_idx",
+        "color_idx",
+        "contains",
+        "init_pos",
+        "cur_pos",
+    )
+
     def __init__(self, type, color):
         assert type in OBJECT_TO_IDX, type
         assert color in COLOR_TO_IDX, color
@@ -33,6 +46,26 @@ class WorldObj:
         # Current position of the object
         self.cur_pos = None
 
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        self._type = value
+        # Integer index cached alongside the name, so that encoding and
+        # comparisons on the step hot path don't need a dict lookup
+        self.type_idx = OBJECT_TO_IDX[value]
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        self._color = value
+        self.color_idx = COLOR_TO_IDX[value]
+
     def can_overlap(self):
         """Can the agent overlap with this?"""
         return False
@@ -55,7 +88,7 @@ class WorldObj:
 
     def encode(self):
         """Encode the a description of this object as a 3-tuple of integers"""
-        return (OBJECT_TO_IDX[self.type], COLOR_TO_IDX[self.color], 0)
+        return (self.type_idx, self.color_idx, 0)
 
     @staticmethod
     def decode(type_idx, color_idx, state):
@@ -98,6 +131,8 @@ class WorldObj:
 
 
 class Goal(WorldObj):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("goal", "green")
 
@@ -113,6 +148,8 @@ class Floor(WorldObj):
     Colored floor tile the agent can walk over
     """
 
+    __slots__ = ()
+
     def __init__(self, color="blue"):
         super().__init__("floor", color)
 
@@ -126,6 +163,8 @@ class Floor(WorldObj):
 
 
 class Lava(WorldObj):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("lava", "red")
 
@@ -149,6 +188,8 @@ class Lava(WorldObj):
 
 
 class Wall(WorldObj):
+    __slots__ = ()
+
     def __init__(self, color="grey"):
         super().__init__("wall", color)
 
@@ -160,6 +201,8 @@ class Wall(WorldObj):
 
 
 class Door(WorldObj):
+    __slots__ = ("is_open", "is_locked")
+
     def __init__(self, color, is_open=False, is_locked=False):
         super().__init__("door", color)
         self.is_open = is_open
@@ -200,7 +243,7 @@ class Door(WorldObj):
                 f"There is no possible state encoding for the state:\n -Door Open: {self.is_open}\n -Door Closed: {not self.is_open}\n -Door Locked: {self.is_locked}"
             )
 
-        return (OBJECT_TO_IDX[self.type], COLOR_TO_IDX[self.color], state)
+        return (self.type_idx, self.color_idx, state)
 
     def render(self, img):
         c = COLORS[self.color]
@@ -228,6 +271,8 @@ class Door(WorldObj):
 
 
 class Key(WorldObj):
+    __slots__ = ()
+
     def __init__(self, color="blue"):
         super().__init__("key", color)
 
@@ -250,6 +295,8 @@ class Key(WorldObj):
 
 
 class Ball(WorldObj):
+    __slots__ = ()
+
     def __init__(self, color="blue"):
         super().__init__("ball", color)
 
@@ -261,6 +308,8 @@ class Ball(WorldObj):
 
 
 class Box(WorldObj):
+    __slots__ = ()
+
     def __init__(self, color, contains=None):
         super().__init__("box", color)
         self.contains = contains
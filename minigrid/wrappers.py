@@ -356,11 +356,11 @@ class DictObservationSpaceWrapper(ObservationWrapper):
         return indices
 
     def observation(self, obs):
-        obs["mission"] = self.string_to_indices(obs["mission"])
-        assert len(obs["mission"]) < self.max_words_in_mission
-        obs["mission"] += [0] * (self.max_words_in_mission - len(obs["mission"]))
+        mission = self.string_to_indices(obs["mission"])
+        assert len(mission) < self.max_words_in_mission
+        mission += [0] * (self.max_words_in_mission - len(mission))
 
-        return obs
+        return {**obs, "mission": mission}
 
 
 class FlatObsWrapper(ObservationWrapper):
@@ -491,8 +491,8 @@ class DirectionObsWrapper(ObservationWrapper):
             self.goal_position[1] - self.agent_pos[1],
             self.goal_position[0] - self.agent_pos[0],
         )
-        obs["goal_direction"] = np.arctan(slope) if self.type == "angle" else slope
-        return obs
+        goal_direction = np.arctan(slope) if self.type == "angle" else slope
+        return {**obs, "goal_direction": goal_direction}
 
 
 class SymbolicObsWrapper(ObservationWrapper):
@@ -523,5 +523,4 @@ class SymbolicObsWrapper(ObservationWrapper):
         grid = np.mgrid[:w, :h]
         grid = np.concatenate([grid, objects.reshape(1, w, h)])
         grid = np.transpose(grid, (1, 2, 0))
-        obs["image"] = grid
-        return obs
+        return {**obs, "image": grid}
@@ -163,6 +163,50 @@ def test_max_steps_argument(env_spec):
     env.close()
 
 
+def test_emit_image_argument():
+    """
+    Test that an environment initialized with `emit_image=False` skips the
+    view encoding but otherwise behaves identically to the default: the
+    observation image stays all-zero and inside the declared observation
+    space while direction, rewards, and termination match step for step.
+    """
+    env = gym.make("MiniGrid-Empty-8x8-v0", disable_env_checker=True)
+    env_no_image = gym.make(
+        "MiniGrid-Empty-8x8-v0", emit_image=False, disable_env_checker=True
+    )
+
+    obs, _ = env.reset(seed=0)
+    obs_no_image, _ = env_no_image.reset(seed=0)
+    assert obs["image"].any()
+    assert not obs_no_image["image"].any()
+    assert env_no_image.observation_space.contains(obs_no_image)
+
+    env.action_space.seed(0)
+    while True:
+        action = env.action_space.sample()
+        obs, reward, terminated, truncated, _ = env.step(action)
+        (
+            obs_no_image,
+            reward_no_image,
+            terminated_no_image,
+            truncated_no_image,
+            _,
+        ) = env_no_image.step(action)
+
+        assert not obs_no_image["image"].any()
+        assert env_no_image.observation_space.contains(obs_no_image)
+        assert obs_no_image["direction"] == obs["direction"]
+        assert reward_no_image == reward
+        assert terminated_no_image == terminated
+        assert truncated_no_image == truncated
+
+        if terminated or truncated:
+            break
+
+    env.close()
+    env_no_image.close()
+
+
 @pytest.mark.parametrize(
     "env_spec",
     all_testing_env_specs,
@@ -9,6 +9,7 @@ from minigrid.envs import EmptyEnv
 from minigrid.wrappers import (
     ActionBonus,
     DictObservationSpaceWrapper,
+    DirectionObsWrapper,
     FlatObsWrapper,
     FullyObsWrapper,
     ImgObsWrapper,
@@ -17,6 +18,7 @@ from minigrid.wrappers import (
     RGBImgObsWrapper,
     RGBImgPartialObsWrapper,
     StateBonus,
+    SymbolicObsWrapper,
     ViewSizeWrapper,
 )
 from tests.utils import all_testing_env_specs, assert_equals, minigrid_testing_env_specs
@@ -248,3 +250,44 @@ def test_agent_sees_method(wrapper):
     assert (obs1["size"] == [5, 5]).all()
     for key in obs2:
         assert np.array_equal(obs1[key], obs2[key])
+
+
+@pytest.mark.parametrize(
+    "wrapper",
+    [
+        DictObservationSpaceWrapper,
+        DirectionObsWrapper,
+        FlatObsWrapper,
+        FullyObsWrapper,
+        ImgObsWrapper,
+        OneHotPartialObsWrapper,
+        RGBImgObsWrapper,
+        RGBImgPartialObsWrapper,
+        SymbolicObsWrapper,
+        ViewSizeWrapper,
+    ],
+)
+def test_wrapper_does_not_alter_raw_observation(wrapper):
+    """
+    The raw environment reuses its observation dict and image buffer across
+    steps, so observation wrappers must not edit the dict they receive in
+    place: stepping through a wrapper must leave the raw env's next
+    observation unchanged.
+    """
+    env = wrapper(gym.make("MiniGrid-Empty-8x8-v0"))
+    env.reset()
+    env.step(Actions.forward)
+
+    raw_env = env.unwrapped
+    obs = raw_env.gen_obs()
+
+    assert sorted(obs.keys()) == ["direction", "image", "mission"]
+    assert obs["image"] is raw_env._obs_buf
+    assert obs["image"].shape == (
+        raw_env.agent_view_size,
+        raw_env.agent_view_size,
+        3,
+    )
+    assert obs["image"].dtype == np.uint8
+    assert isinstance(obs["mission"], str)
+    env.close()